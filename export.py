@@ -3,13 +3,28 @@
 Working OpenMetadata Export Tool with proper SDK integration
 """
 
+import copy
 import json
 import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Union,
+)
 
 import click
 import yaml
@@ -19,6 +34,16 @@ from rich.console import Console
 from rich.progress import Progress, TaskID
 from rich.table import Table as RichTable
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     from metadata.generated.schema.entity.data.database import Database
     from metadata.generated.schema.entity.data.databaseSchema import DatabaseSchema
@@ -28,18 +53,14 @@ try:
     from metadata.generated.schema.entity.domains.dataProduct import DataProduct
     from metadata.generated.schema.entity.domains.domain import Domain
     from metadata.generated.schema.entity.policies.policy import Policy
-    from metadata.generated.schema.entity.services.connections.metadata.openMetadataConnection import (
-        OpenMetadataConnection,
-    )
     from metadata.generated.schema.entity.services.databaseService import (
         DatabaseService,
     )
     from metadata.generated.schema.entity.teams.team import Team
     from metadata.generated.schema.entity.teams.user import User
-    from metadata.generated.schema.security.client.openMetadataJWTClientConfig import (
-        OpenMetadataJWTClientConfig,
-    )
     from metadata.ingestion.ometa.ometa_api import OpenMetadata
+
+    from om_client import get_client
 except ImportError as e:
     rprint(f"[red]Error importing OpenMetadata SDK: {e}[/red]")
     rprint(
@@ -49,74 +70,91 @@ except ImportError as e:
 
 console = Console()
 
+# libyaml's parser is much faster than the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean environment variable."""
+    return value.lower() == "true"
+
+
+# Environment variable -> (config path, parser)
+_ENV_MAP = (
+    ("OPENMETADATA_SERVER_URL", ("openmetadata", "server_url"), str),
+    ("OPENMETADATA_JWT_TOKEN", ("openmetadata", "auth", "jwt_token"), str),
+    ("EXPORT_OUTPUT_DIR", ("export", "output_dir"), str),
+    ("EXPORT_BATCH_SIZE", ("export", "batch_size"), int),
+    ("EXPORT_INCLUDE_DELETED", ("export", "include_deleted"), _parse_bool),
+)
+
 
 class OpenMetadataExporter:
     """Export OpenMetadata entities to NDJSON files using OpenMetadata SDK."""
 
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(
+        self,
+        config_path: Union[str, Path, TextIO] = "config.yaml",
+        config: Optional[Dict[str, Any]] = None,
+    ):
         """Initialize the exporter with configuration."""
         load_dotenv()
-        self.config = self._load_config(config_path)
+        self.config = config if config is not None else self._load_config(config_path)
         self._apply_env_overrides()
         self.om_client = self._create_client()
         self.export_stats = {}
 
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> "OpenMetadataExporter":
+        """Create an exporter from an already loaded configuration."""
+        # Copied so environment overrides leave the caller's dict untouched
+        return cls(config=copy.deepcopy(config))
+
+    def _load_config(self, config_path: Union[str, Path, TextIO]) -> Dict[str, Any]:
+        """Load configuration from a YAML or JSON file, or a YAML text stream."""
+        if hasattr(config_path, "read"):
+            try:
+                return yaml.load(config_path, Loader=_YAML_LOADER)
+            except yaml.YAMLError as e:
+                console.print(f"[red]Error parsing configuration: {e}[/red]")
+                sys.exit(1)
+
         try:
             with open(config_path, "r") as f:
-                config = yaml.safe_load(f)
+                if Path(config_path).suffix == ".json":
+                    config = json.load(f)
+                else:
+                    config = yaml.load(f, Loader=_YAML_LOADER)
             return config
         except FileNotFoundError:
             console.print(f"[red]Configuration file {config_path} not found![/red]")
             sys.exit(1)
-        except yaml.YAMLError as e:
+        except (yaml.YAMLError, json.JSONDecodeError) as e:
             console.print(f"[red]Error parsing configuration file: {e}[/red]")
             sys.exit(1)
 
     def _apply_env_overrides(self):
         """Apply environment variable overrides to configuration."""
-        if os.getenv("OPENMETADATA_SERVER_URL"):
-            self.config["openmetadata"]["server_url"] = os.getenv(
-                "OPENMETADATA_SERVER_URL"
-            )
-        if os.getenv("OPENMETADATA_JWT_TOKEN"):
-            self.config["openmetadata"]["auth"]["jwt_token"] = os.getenv(
-                "OPENMETADATA_JWT_TOKEN"
-            )
-        if os.getenv("EXPORT_OUTPUT_DIR"):
-            self.config["export"]["output_dir"] = os.getenv("EXPORT_OUTPUT_DIR")
-        if os.getenv("EXPORT_BATCH_SIZE"):
-            self.config["export"]["batch_size"] = int(os.getenv("EXPORT_BATCH_SIZE"))
-        if os.getenv("EXPORT_INCLUDE_DELETED"):
-            self.config["export"]["include_deleted"] = (
-                os.getenv("EXPORT_INCLUDE_DELETED").lower() == "true"
-            )
+        for name, path, parse in _ENV_MAP:
+            value = os.environ.get(name)
+            if value:
+                section = self.config
+                for key in path[:-1]:
+                    section = section[key]
+                section[path[-1]] = parse(value)
 
     def _create_client(self) -> OpenMetadata:
         """Create OpenMetadata client from configuration."""
         try:
             om_config = self.config["openmetadata"]
-            server_url = om_config["server_url"]
-            auth_config = om_config.get("auth", {})
-
-            if "jwt_token" in auth_config and auth_config["jwt_token"]:
-                auth_provider = "openmetadata"
-                auth_config_obj = OpenMetadataJWTClientConfig(
-                    jwtToken=auth_config["jwt_token"]
-                )
-            else:
-                auth_provider = None
-                auth_config_obj = None
-
-            metadata_connection = OpenMetadataConnection(
-                hostPort=server_url,
-                authProvider=auth_provider,
-                securityConfig=auth_config_obj,
+            advanced = self.config.get("advanced", {})
+            return get_client(
+                om_config["server_url"],
+                om_config.get("auth", {}).get("jwt_token") or None,
+                pool_size=advanced.get("http_pool_size", 32),
+                max_retries=advanced.get("max_retries", 3),
             )
 
-            return OpenMetadata(metadata_connection)
-
         except Exception as e:
             console.print(f"[red]Error creating OpenMetadata client: {e}[/red]")
             sys.exit(1)
@@ -127,24 +165,87 @@ class OpenMetadataExporter:
         output_dir.mkdir(parents=True, exist_ok=True)
         return output_dir
 
-    def _write_ndjson(self, entities: List[Dict], filename: str, output_dir: Path):
-        """Write entities to NDJSON file."""
-        filepath = output_dir / f"{filename}.ndjson"
-
+    @staticmethod
+    @contextmanager
+    def _open_atomic(filepath: Path) -> Iterator[BinaryIO]:
+        """Open a sibling temp file that replaces `filepath` only on success."""
+        # Entities are fetched while the file is written, so a failed page
+        # must leave the previous export in place rather than a partial file
+        tmp_path = filepath.with_suffix(filepath.suffix + ".tmp")
         try:
-            with filepath.open("w", encoding="utf-8") as f:
-                for entity in entities:
-                    json.dump(entity, f, ensure_ascii=False, default=str)
-                    f.write("\n")
-
-            console.print(
-                f"[green]✓[/green] Exported {len(entities)} {filename} to {filepath}"
-            )
-            return len(entities)
-
-        except Exception as e:
-            console.print(f"[red]✗[/red] Error writing {filename}: {e}")
-            return 0
+            with tmp_path.open("wb", buffering=1 << 20) as f:
+                yield f
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _write_ndjson(self, entities: Iterable[Dict], filename: str, output_dir: Path):
+        """Stream entities to an NDJSON file, one line per entity."""
+        filepath = output_dir / f"{filename}.ndjson"
+        count = 0
+
+        # A 1 MiB buffer batches many entity lines into each write syscall,
+        # and joining lines in chunks cuts the number of write() calls
+        # without holding the whole export in memory
+        entities = iter(entities)
+        with self._open_atomic(filepath) as f:
+            while chunk := list(islice(entities, 1000)):
+                f.write(b"\n".join(map(self._entity_to_json, chunk)) + b"\n")
+                count += len(chunk)
+
+        console.print(f"[green]✓[/green] Exported {count} {filename} to {filepath}")
+        return count
+
+    def _write_msgpack(self, entities: Iterable[Dict], filename: str, output_dir: Path):
+        """Stream entities to a MessagePack file, one packed object per entity."""
+        filepath = output_dir / f"{filename}.msgpack"
+        packer = msgpack.Packer(use_bin_type=True, default=str)
+        count = 0
+
+        with self._open_atomic(filepath) as f:
+            for entity in entities:
+                f.write(packer.pack(entity))
+                count += 1
+
+        console.print(f"[green]✓[/green] Exported {count} {filename} to {filepath}")
+        return count
+
+    def _iter_entities(self, entity_class) -> Iterator[Dict]:
+        """Yield raw entity dictionaries, paging with the API's `after` cursor."""
+        page_size = self.config["export"].get("batch_size", 100)
+        # Request the list endpoint directly so entities stay as the server's
+        # JSON instead of being validated into Pydantic models and dumped back
+        path = self.om_client.get_suffix(entity_class)
+
+        def fetch_page(after: Optional[str]) -> Dict:
+            params = {"limit": page_size}
+            if after:
+                params["after"] = after
+            response = self.om_client.client.get(path, data=params)
+            if response is None:
+                raise RuntimeError(f"No response listing {path}")
+            return response
+
+        # Fetch the next page in the background while the current one is
+        # being serialized and written
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(fetch_page, None)
+
+            while next_page is not None:
+                response = next_page.result()
+
+                after = response.get("paging", {}).get("after")
+                next_page = executor.submit(fetch_page, after) if after else None
+
+                yield from response.get("data", [])
+
+    @staticmethod
+    def _entity_to_json(entity: Dict) -> bytes:
+        """Serialize a raw entity dictionary to UTF-8 JSON."""
+        if orjson is not None:
+            return orjson.dumps(entity, default=str)
+        return json.dumps(entity, ensure_ascii=False, default=str).encode()
 
     def _export_entity_type(
         self, entity_name: str, entity_class, output_dir: Path
@@ -153,35 +254,13 @@ class OpenMetadataExporter:
         try:
             console.print(f"[blue]Exporting {entity_name}...[/blue]")
 
-            # Use the OpenMetadata SDK to get all entities
-            entities_response = self.om_client.list_entities(
-                entity=entity_class, limit=10000
-            )
-
-            if hasattr(entities_response, "entities"):
-                entities = entities_response.entities
+            # Entities are serialized and written as each page arrives, so
+            # they never accumulate in memory
+            if self.config["export"].get("format", "ndjson") == "msgpack":
+                writer = self._write_msgpack
             else:
-                entities = []
-
-            console.print(f"[green]Retrieved {len(entities)} {entity_name}[/green]")
-
-            # Convert entities to dictionaries using modern Pydantic
-            entity_dicts = []
-            for entity in entities:
-                if hasattr(entity, "model_dump"):
-                    # Modern Pydantic v2
-                    entity_dict = entity.model_dump()
-                elif hasattr(entity, "dict"):
-                    # Legacy Pydantic v1
-                    entity_dict = entity.dict()
-                else:
-                    entity_dict = (
-                        entity.__dict__ if hasattr(entity, "__dict__") else dict(entity)
-                    )
-
-                entity_dicts.append(entity_dict)
-
-            return self._write_ndjson(entity_dicts, entity_name, output_dir)
+                writer = self._write_ndjson
+            return writer(self._iter_entities(entity_class), entity_name, output_dir)
 
         except Exception as e:
             console.print(f"[red]✗[/red] Error exporting {entity_name}: {e}")
@@ -193,6 +272,12 @@ class OpenMetadataExporter:
         console.print(f"📍 Server: {self.config['openmetadata']['server_url']}")
         console.print(f"🔧 API Method: OpenMetadata SDK")
 
+        if self.config["export"].get("format", "ndjson") == "msgpack" and not msgpack:
+            console.print(
+                "[red]MessagePack export requires msgpack: pip install msgpack[/red]"
+            )
+            sys.exit(1)
+
         output_dir = self._ensure_output_dir()
 
         # Define entity mappings (entity_name -> entity_class)
@@ -4,12 +4,26 @@ OpenMetadata Import Tool
 Imports metadata entities from NDJSON files to OpenMetadata for restore or migration.
 """
 
+import copy
 import json
 import os
 import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Union,
+)
 
 import click
 import yaml
@@ -19,6 +33,19 @@ from rich.console import Console
 from rich.progress import Progress, TaskID
 from rich.table import Table
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from msgspec.json import decode as json_loads
+    except ImportError:
+        from json import loads as json_loads
+
 try:
     from metadata.generated.schema.api.domains.createDataProduct import (
         CreateDataProductRequest,
@@ -35,13 +62,9 @@ try:
     from metadata.generated.schema.api.teams.createUser import (
         CreateUserRequest,
     )
-    from metadata.generated.schema.entity.services.connections.metadata.openMetadataConnection import (
-        OpenMetadataConnection,
-    )
-    from metadata.generated.schema.security.client.openMetadataJWTClientConfig import (
-        OpenMetadataJWTClientConfig,
-    )
     from metadata.ingestion.ometa.ometa_api import OpenMetadata
+
+    from om_client import get_client
 except ImportError as e:
     rprint(f"[red]Error importing OpenMetadata SDK: {e}[/red]")
     rprint(
@@ -51,226 +74,468 @@ except ImportError as e:
 
 console = Console()
 
+# libyaml's parser is much faster than the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean environment variable."""
+    return value.lower() == "true"
+
+
+# Environment variable -> (config path, parser)
+_ENV_MAP = (
+    ("OPENMETADATA_SERVER_URL", ("openmetadata", "server_url"), str),
+    ("OPENMETADATA_JWT_TOKEN", ("openmetadata", "auth", "jwt_token"), str),
+    ("IMPORT_INPUT_DIR", ("import", "input_dir"), str),
+    ("IMPORT_UPDATE_EXISTING", ("import", "update_existing"), _parse_bool),
+    ("IMPORT_SKIP_ON_ERROR", ("import", "skip_on_error"), _parse_bool),
+    ("LOG_LEVEL", ("logging", "level"), str),
+)
+
 
 class OpenMetadataImporter:
     """Import OpenMetadata entities from NDJSON files."""
 
-    def __init__(self, config_path: str = "config.yaml"):
+    # Create request class used for each importable entity type
+    _REQUEST_CLASSES = {
+        "data_products": CreateDataProductRequest,
+        "domains": CreateDomainRequest,
+        "teams": CreateTeamRequest,
+        "users": CreateUserRequest,
+        "policies": CreatePolicyRequest,
+    }
+
+    # Fields accepted by each Create*Request; anything else is dropped
+    _ALLOWED_FIELDS = {
+        "data_products": frozenset(
+            {
+                "name",
+                "displayName",
+                "description",
+                "fullyQualifiedName",
+                "owners",
+                "experts",
+                "domain",
+                "assets",
+                "tags",
+                "extension",
+            }
+        ),
+        "domains": frozenset(
+            {
+                "name",
+                "displayName",
+                "description",
+                "fullyQualifiedName",
+                "domainType",
+                "parent",
+                "owners",
+                "experts",
+                "tags",
+                "extension",
+            }
+        ),
+        "teams": frozenset(
+            {
+                "name",
+                "displayName",
+                "description",
+                "fullyQualifiedName",
+                "teamType",
+                "email",
+                "parents",
+                "users",
+                "owners",
+                "defaultRoles",
+            }
+        ),
+    }
+
+    # Exported references embed the full related entity; create requests
+    # only need an EntityReference, a bare id or an FQN, depending on the field
+    _REFERENCE_FIELDS = frozenset({"owners", "assets"})
+    _ID_FIELDS = frozenset({"parents", "users", "defaultRoles"})
+    _FQN_FIELDS = frozenset({"experts", "domain", "parent"})
+    _SHRUNK_FIELDS = _REFERENCE_FIELDS | _ID_FIELDS | _FQN_FIELDS
+
+    # Types whose entities reference a parent of the same type; the parent
+    # must exist first, so these are imported one batch at a time in file order
+    _SELF_REFERENCING_TYPES = frozenset({"domains", "teams"})
+
+    def __init__(
+        self,
+        config_path: Union[str, Path, TextIO] = "config.yaml",
+        config: Optional[Dict[str, Any]] = None,
+    ):
         """Initialize the importer with configuration."""
         # Load environment variables from .env file
         load_dotenv()
-        self.config = self._load_config(config_path)
+        self.config = config if config is not None else self._load_config(config_path)
         self._apply_env_overrides()
         self.om_client = self._create_client()
         self.import_stats = {}
         self.errors = []
+        self._lock = threading.Lock()
+        # Entity types whose bulk endpoint the server does not provide
+        self._bulk_unsupported = set()
+        # Checkpoint of imported FQNs per entity type, for resuming a run
+        self._state_file: Optional[Path] = None
+        self._import_state: Dict[str, Set[str]] = {}
+        self._resumed: Dict[str, Set[str]] = {}
+        self._unsaved_count = 0
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> "OpenMetadataImporter":
+        """Create an importer from an already loaded configuration."""
+        # Copied so environment overrides leave the caller's dict untouched
+        return cls(config=copy.deepcopy(config))
+
+    def _load_config(self, config_path: Union[str, Path, TextIO]) -> Dict[str, Any]:
+        """Load configuration from a YAML or JSON file, or a YAML text stream."""
+        if hasattr(config_path, "read"):
+            try:
+                return yaml.load(config_path, Loader=_YAML_LOADER)
+            except yaml.YAMLError as e:
+                console.print(f"[red]Error parsing configuration: {e}[/red]")
+                sys.exit(1)
 
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
         try:
             with open(config_path, "r") as f:
-                config = yaml.safe_load(f)
+                if Path(config_path).suffix == ".json":
+                    config = json.load(f)
+                else:
+                    config = yaml.load(f, Loader=_YAML_LOADER)
             return config
         except FileNotFoundError:
             console.print(f"[red]Configuration file {config_path} not found![/red]")
             sys.exit(1)
-        except yaml.YAMLError as e:
+        except (yaml.YAMLError, json.JSONDecodeError) as e:
             console.print(f"[red]Error parsing configuration file: {e}[/red]")
             sys.exit(1)
 
     def _apply_env_overrides(self):
         """Apply environment variable overrides to configuration."""
-        # OpenMetadata server configuration
-        if os.getenv("OPENMETADATA_SERVER_URL"):
-            self.config["openmetadata"]["server_url"] = os.getenv(
-                "OPENMETADATA_SERVER_URL"
-            )
-
-        if os.getenv("OPENMETADATA_JWT_TOKEN"):
-            self.config["openmetadata"]["auth"]["jwt_token"] = os.getenv(
-                "OPENMETADATA_JWT_TOKEN"
-            )
-
-        # Import configuration
-        if os.getenv("IMPORT_INPUT_DIR"):
-            self.config["import"]["input_dir"] = os.getenv("IMPORT_INPUT_DIR")
-
-        if os.getenv("IMPORT_UPDATE_EXISTING"):
-            self.config["import"]["update_existing"] = (
-                os.getenv("IMPORT_UPDATE_EXISTING").lower() == "true"
-            )
-
-        if os.getenv("IMPORT_SKIP_ON_ERROR"):
-            self.config["import"]["skip_on_error"] = (
-                os.getenv("IMPORT_SKIP_ON_ERROR").lower() == "true"
-            )
-
-        # Logging configuration
-        if os.getenv("LOG_LEVEL"):
-            self.config["logging"]["level"] = os.getenv("LOG_LEVEL")
+        for name, path, parse in _ENV_MAP:
+            value = os.environ.get(name)
+            if value:
+                section = self.config
+                for key in path[:-1]:
+                    section = section[key]
+                section[path[-1]] = parse(value)
 
     def _create_client(self) -> OpenMetadata:
         """Create OpenMetadata client from configuration."""
         try:
             om_config = self.config["openmetadata"]
-            server_url = om_config["server_url"]
-
-            # Create authentication config
-            auth_config = om_config.get("auth", {})
-
-            if "jwt_token" in auth_config and auth_config["jwt_token"]:
-                # JWT Token authentication
-                auth_provider = "openmetadata"
-                auth_config_obj = OpenMetadataJWTClientConfig(
-                    jwtToken=auth_config["jwt_token"]
-                )
-            else:
-                # No authentication for now (can be extended)
-                auth_provider = None
-                auth_config_obj = None
-
-            # Create connection config
-            metadata_connection = OpenMetadataConnection(
-                hostPort=server_url,
-                authProvider=auth_provider,
-                securityConfig=auth_config_obj,
+            advanced = self.config.get("advanced", {})
+            # Every concurrent import worker needs its own pooled connection,
+            # otherwise urllib3 discards and re-handshakes the surplus
+            pool_size = max(
+                advanced.get("http_pool_size", 32),
+                self.config["import"].get("parallelism", 16),
+            )
+            return get_client(
+                om_config["server_url"],
+                om_config.get("auth", {}).get("jwt_token") or None,
+                pool_size=pool_size,
+                max_retries=advanced.get("max_retries", 3),
             )
-
-            # Create and return OpenMetadata client
-            return OpenMetadata(metadata_connection)
 
         except Exception as e:
             console.print(f"[red]Error creating OpenMetadata client: {e}[/red]")
             sys.exit(1)
 
-    def _load_ndjson(self, filepath: Path) -> List[Dict]:
-        """Load entities from NDJSON file."""
-        entities = []
+    def _iter_ndjson(self, filepath: Path) -> Iterator[Dict]:
+        """Lazily yield entities from an NDJSON file, one line at a time."""
         try:
-            with filepath.open("r", encoding="utf-8") as f:
+            # Parse raw bytes; both parsers accept a trailing newline, so lines
+            # are neither decoded nor stripped first
+            with filepath.open("rb", buffering=4 << 20) as f:
+                if hasattr(os, "posix_fadvise"):
+                    # Files are read once front to back; let the kernel read ahead
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
                 for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if line:
-                        try:
-                            entity = json.loads(line)
-                            entities.append(entity)
-                        except json.JSONDecodeError as e:
-                            console.print(
-                                f"[yellow]⚠[/yellow] Error parsing line {line_num} in {filepath}: {e}"
-                            )
-            return entities
+                    if line.isspace():
+                        continue
+                    try:
+                        yield json_loads(line)
+                    except ValueError as e:
+                        # Base class of the json, orjson and msgspec decode errors
+                        console.print(
+                            f"[yellow]⚠[/yellow] Error parsing line {line_num} in {filepath}: {e}"
+                        )
+        except FileNotFoundError:
+            console.print(f"[yellow]⚠[/yellow] File not found: {filepath}")
+        except Exception as e:
+            console.print(f"[red]✗[/red] Error reading {filepath}: {e}")
+
+    def _iter_msgpack(self, filepath: Path) -> Iterator[Dict]:
+        """Lazily yield entities from a MessagePack export file."""
+        if msgpack is None:
+            console.print(
+                f"[red]✗[/red] Reading {filepath} requires msgpack: pip install msgpack"
+            )
+            return
+        try:
+            with filepath.open("rb") as f:
+                yield from msgpack.Unpacker(f, raw=False)
         except FileNotFoundError:
             console.print(f"[yellow]⚠[/yellow] File not found: {filepath}")
-            return []
         except Exception as e:
             console.print(f"[red]✗[/red] Error reading {filepath}: {e}")
-            return []
+
+    def _load_ndjson(self, filepath: Path) -> List[Dict]:
+        """Load entities from NDJSON file."""
+        return list(self._iter_ndjson(filepath))
+
+    def _count_ndjson(self, filepath: Path) -> int:
+        """Count non-empty lines in an NDJSON file without parsing them."""
+        with filepath.open("rb") as f:
+            return sum(1 for line in f if not line.isspace())
+
+    def _entity_file(self, entity_type: str, input_dir: Path) -> Path:
+        """Return the export file for an entity type, preferring NDJSON."""
+        ndjson_path = input_dir / f"{entity_type}.ndjson"
+        msgpack_path = input_dir / f"{entity_type}.msgpack"
+        if not ndjson_path.exists() and msgpack_path.exists():
+            return msgpack_path
+        return ndjson_path
+
+    def _iter_entities(self, filepath: Path) -> Iterator[Dict]:
+        """Lazily yield entities from an NDJSON or MessagePack export file."""
+        if filepath.suffix == ".msgpack":
+            return self._iter_msgpack(filepath)
+        return self._iter_ndjson(filepath)
+
+    def _count_entities(self, filepath: Path) -> int:
+        """Count entities in an export file."""
+        if filepath.suffix == ".msgpack":
+            # There are no lines to count, so the whole file is decoded
+            return sum(1 for _ in self._iter_msgpack(filepath))
+        return self._count_ndjson(filepath)
 
     def _filter_entity_fields(self, entity_data: Dict, entity_type: str) -> Dict:
         """Filter entity data to only include fields valid for creation."""
-        if entity_type == "data_products":
-            # Fields allowed in CreateDataProductRequest
-            allowed_fields = {
-                "name",
-                "displayName",
-                "description",
-                "fullyQualifiedName",
-                "owners",
-                "experts",
-                "domain",
-                "assets",
-                "tags",
-                "extension",
-            }
-            filtered_data = {
-                k: v for k, v in entity_data.items() if k in allowed_fields
-            }
+        allowed_fields = self._ALLOWED_FIELDS.get(entity_type)
+        if allowed_fields is None:
+            # For other entity types, return as-is for now
+            return entity_data
 
-            # Convert domain from dict to string if needed
-            if "domain" in filtered_data and isinstance(filtered_data["domain"], dict):
-                filtered_data["domain"] = filtered_data["domain"].get(
-                    "fullyQualifiedName", str(filtered_data["domain"].get("name", ""))
+        filtered_data = {}
+        for key in allowed_fields & entity_data.keys():
+            value = entity_data[key]
+            if key in self._SHRUNK_FIELDS:
+                if isinstance(value, list):
+                    value = [self._shrink_ref(v, key) for v in value]
+                else:
+                    value = self._shrink_ref(value, key)
+            filtered_data[key] = value
+
+        return filtered_data
+
+    @classmethod
+    def _shrink_ref(cls, value: Any, field: str) -> Any:
+        """Reduce an exported entity reference to what the create request needs."""
+        if not isinstance(value, dict):
+            return value
+        if field in cls._REFERENCE_FIELDS and "id" in value:
+            return {"id": value["id"], "type": value["type"]}
+        if field in cls._ID_FIELDS and "id" in value:
+            return value["id"]
+        if field in cls._FQN_FIELDS:
+            return value.get("fullyQualifiedName", str(value.get("name", "")))
+        return value
+
+    def _load_import_state(self, input_dir: Path):
+        """Load the import checkpoint, resuming from it if configured."""
+        state_file = input_dir / "import_state.json"
+        if state_file == self._state_file:
+            return
+
+        self._state_file = state_file
+        self._import_state = {}
+        if self.config["import"].get("resume", False) and state_file.exists():
+            with state_file.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+            # A checkpoint only says what exists on the server it was written for
+            server_url = self.config["openmetadata"]["server_url"]
+            if state.get("server_url") != server_url:
+                console.print(
+                    f"[yellow]⚠[/yellow] Ignoring {state_file}: it was written "
+                    f"for {state.get('server_url')}, not {server_url}"
                 )
+            else:
+                self._import_state = {
+                    entity_type: set(fqns)
+                    for entity_type, fqns in state["entities"].items()
+                }
+                resumed = sum(len(fqns) for fqns in self._import_state.values())
+                console.print(f"Resuming import: skipping {resumed} imported entities")
+        self._resumed = {
+            entity_type: set(fqns) for entity_type, fqns in self._import_state.items()
+        }
 
-            return filtered_data
-        elif entity_type == "domains":
-            # Add domain-specific filtering here if needed
-            allowed_fields = {
-                "name",
-                "displayName",
-                "description",
-                "fullyQualifiedName",
-                "domainType",
-                "parent",
-                "owners",
-                "experts",
-                "tags",
-                "extension",
-            }
-            return {k: v for k, v in entity_data.items() if k in allowed_fields}
-        elif entity_type == "teams":
-            # Add team-specific filtering here if needed
-            allowed_fields = {
-                "name",
-                "displayName",
-                "description",
-                "fullyQualifiedName",
-                "teamType",
-                "email",
-                "parents",
-                "users",
-                "owners",
-                "defaultRoles",
-            }
-            return {k: v for k, v in entity_data.items() if k in allowed_fields}
-        else:
-            # For other entity types, return as-is for now
-            return entity_data
+    def _save_import_state(self):
+        """Atomically write the import checkpoint."""
+        if self._state_file is None:
+            return
+
+        with self._lock:
+            tmp_file = self._state_file.with_suffix(".tmp")
+            with tmp_file.open("w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "server_url": self.config["openmetadata"]["server_url"],
+                        "entities": {
+                            entity_type: sorted(fqns)
+                            for entity_type, fqns in self._import_state.items()
+                        },
+                    },
+                    f,
+                )
+            os.replace(tmp_file, self._state_file)
+            self._unsaved_count = 0
+
+    def _mark_imported(self, entity_type: str, entities: List[Dict]):
+        """Checkpoint successfully imported entities, saving every 100."""
+        fqns = [e["fullyQualifiedName"] for e in entities if "fullyQualifiedName" in e]
+        with self._lock:
+            self._import_state.setdefault(entity_type, set()).update(fqns)
+            self._unsaved_count += len(fqns)
+            save = self._unsaved_count >= 100
+        if save:
+            self._save_import_state()
+
+    def _clear_import_state(self, entity_type: Optional[str] = None):
+        """Remove the import checkpoint, or one finished type's entry in it."""
+        if entity_type is not None:
+            with self._lock:
+                self._import_state.pop(entity_type, None)
+            self._resumed.pop(entity_type, None)
+            if self._import_state:
+                self._save_import_state()
+                return
+
+        if self._state_file is not None:
+            self._state_file.unlink(missing_ok=True)
+            self._state_file = None
+            self._import_state = {}
+            self._resumed = {}
+
+    def _record_error(self, entity_type: str, error: Exception):
+        """Record an import error, re-raising it unless skip_on_error is set."""
+        error_msg = f"Error importing {entity_type} entity: {error}"
+        with self._lock:
+            self.errors.append(error_msg)
+
+        if not self.config["import"].get("skip_on_error", True):
+            console.print(f"[red]✗[/red] {error_msg}")
+            raise error
+        console.print(f"[yellow]⚠[/yellow] {error_msg} (skipping)")
+
+    def _build_request(self, entity_data: Dict, entity_type: str):
+        """Build the create request for an entity."""
+        request_class = self._REQUEST_CLASSES[entity_type]
+        filtered_data = self._filter_entity_fields(entity_data, entity_type)
+        if self.config["import"].get("trust_input", False):
+            # Our own export is already well formed and the server validates
+            # the request anyway, so skip client-side validation
+            return request_class.model_construct(**filtered_data)
+        return request_class.model_validate(filtered_data)
 
     def _import_entity(self, entity_data: Dict, entity_type: str) -> bool:
         """Import a single entity."""
         try:
-            # Filter fields to only include those valid for creation
-            filtered_data = self._filter_entity_fields(entity_data, entity_type)
-
-            # Create appropriate API request based on entity type
-            if entity_type == "data_products":
-                request = CreateDataProductRequest(**filtered_data)
-                result = self.om_client.create_or_update(request)
-            elif entity_type == "domains":
-                request = CreateDomainRequest(**filtered_data)
-                result = self.om_client.create_or_update(request)
-            elif entity_type == "teams":
-                request = CreateTeamRequest(**filtered_data)
-                result = self.om_client.create_or_update_team(request)
-            elif entity_type == "users":
-                request = CreateUserRequest(**filtered_data)
-                result = self.om_client.create_or_update_user(request)
-            elif entity_type == "policies":
-                request = CreatePolicyRequest(**filtered_data)
-                result = self.om_client.create_or_update_policy(request)
-            else:
+            if entity_type not in self._REQUEST_CLASSES:
                 console.print(
                     f"[yellow]⚠[/yellow] Import method not implemented for {entity_type}"
                 )
                 return False
 
+            # The SDK resolves the endpoint from the request class
+            self.om_client.create_or_update(
+                self._build_request(entity_data, entity_type)
+            )
+
+            self._mark_imported(entity_type, [entity_data])
             return True
 
         except Exception as e:
-            error_msg = f"Error importing {entity_type} entity: {e}"
-            self.errors.append(error_msg)
-
-            if not self.config["import"].get("skip_on_error", True):
-                console.print(f"[red]✗[/red] {error_msg}")
-                raise
-            else:
-                console.print(f"[yellow]⚠[/yellow] {error_msg} (skipping)")
-                return False
+            self._record_error(entity_type, e)
+            return False
+
+    def _bulk_import(self, batch: List[Dict], entity_type: str) -> Optional[int]:
+        """Import a batch through the bulk endpoint, or None if it is unavailable."""
+        request_class = self._REQUEST_CLASSES[entity_type]
+        create_requests = []
+        sent = []
+        invalid = []
+        for entity_data in batch:
+            try:
+                create_requests.append(self._build_request(entity_data, entity_type))
+                sent.append(entity_data)
+            except Exception as e:
+                invalid.append(e)
+
+        failed = []
+        if create_requests:
+            path = f"{self.om_client.get_suffix(request_class)}/bulk"
+            payload = ",".join(
+                request.model_dump_json(context={"mask_secrets": False})
+                for request in create_requests
+            )
+            try:
+                result = self.om_client.client.put(path, data=f"[{payload}]")
+            except Exception as e:
+                # Both APIError and HTTPError expose the failed response
+                response = getattr(e, "response", None)
+                if getattr(response, "status_code", None) in (404, 405):
+                    with self._lock:
+                        self._bulk_unsupported.add(entity_type)
+                    console.print(
+                        f"[yellow]⚠[/yellow] No bulk endpoint for {entity_type}, "
+                        "importing one at a time"
+                    )
+                return None
+
+            if not result:
+                return None
+            failed = [
+                RuntimeError(failed_request.get("message"))
+                for failed_request in result.get("failedRequest") or []
+            ]
+
+        # Failures are not matched back to entities, so only fully successful
+        # batches are checkpointed; create_or_update is safe to repeat
+        if not failed:
+            self._mark_imported(entity_type, sent)
+
+        # Only report errors once the batch is known not to be retried
+        for error in invalid + failed:
+            self._record_error(entity_type, error)
+        return len(create_requests) - len(failed)
+
+    def _import_batch(self, batch: List[Dict], entity_type: str) -> int:
+        """Import a batch of entities, returning the number imported."""
+        if len(batch) > 1 and entity_type not in self._bulk_unsupported:
+            imported = self._bulk_import(batch, entity_type)
+            if imported is not None:
+                return imported
+
+        # Fall back to one request per entity so errors are reported per entity
+        return sum(self._import_entity(entity, entity_type) for entity in batch)
+
+    @staticmethod
+    def _iter_batches(entities: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+        """Group an entity stream into lists of at most `size` entities."""
+        iterator = iter(entities)
+        while batch := list(islice(iterator, size)):
+            yield batch
 
     def _import_entity_type(self, entity_type: str, input_dir: Path) -> int:
         """Import all entities of a specific type."""
-        filepath = input_dir / f"{entity_type}.ndjson"
+        filepath = self._entity_file(entity_type, input_dir)
 
         if not filepath.exists():
             console.print(
@@ -278,30 +543,102 @@ class OpenMetadataImporter:
             )
             return 0
 
+        if entity_type not in self._REQUEST_CLASSES:
+            console.print(
+                f"[yellow]⚠[/yellow] Import method not implemented for {entity_type}"
+            )
+            return 0
+
         console.print(f"[blue]Importing {entity_type}...[/blue]")
-        entities = self._load_ndjson(filepath)
+        # Counting MessagePack entities means decoding the whole file, which
+        # would double the import's cost, so its progress has no total
+        total = None if filepath.suffix == ".msgpack" else self._count_ndjson(filepath)
+        self._load_import_state(input_dir)
 
-        if not entities:
+        if total == 0:
             console.print(f"[yellow]⚠[/yellow] No entities found in {filepath}")
             return 0
 
         success_count = 0
+        max_workers = self.config["import"].get("parallelism", 16)
+        bulk_size = max(1, self.config["import"].get("bulk_size", 50))
+        if entity_type in self._SELF_REFERENCING_TYPES:
+            # A single worker runs batches in submission order, and the bulk
+            # endpoint creates a batch's entities in request order
+            max_workers = 1
+
+        # Other types have no references among themselves, so their batches
+        # can be in flight concurrently over the shared keep-alive connection
+        # pool. Only a small window of batches is read ahead of the workers.
+        resumed = self._resumed.get(entity_type)
+        skipped = 0
+        try:
+            with Progress() as progress, ThreadPoolExecutor(max_workers) as executor:
+                task = progress.add_task(
+                    f"[green]Importing {entity_type}...", total=total
+                )
 
-        with Progress() as progress:
-            task = progress.add_task(
-                f"[green]Importing {entity_type}...", total=len(entities)
-            )
-
-            for entity in entities:
-                if self._import_entity(entity, entity_type):
-                    success_count += 1
-                progress.advance(task)
+                # Maps each in-flight future to the size of its batch
+                pending = {}
+                try:
+                    entities = self._iter_entities(filepath)
+                    for batch in self._iter_batches(entities, bulk_size):
+                        if resumed:
+                            remaining = [
+                                e
+                                for e in batch
+                                if e.get("fullyQualifiedName") not in resumed
+                            ]
+                            skipped += len(batch) - len(remaining)
+                            progress.advance(task, len(batch) - len(remaining))
+                            batch = remaining
+                            if not batch:
+                                continue
+                        if len(pending) >= max_workers * 2:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            success_count += self._collect_results(
+                                done, pending, progress, task
+                            )
+                        future = executor.submit(self._import_batch, batch, entity_type)
+                        pending[future] = len(batch)
+                    success_count += self._collect_results(
+                        as_completed(list(pending)), pending, progress, task
+                    )
+                except BaseException:
+                    # skip_on_error is disabled or the run was interrupted;
+                    # drop imports that have not started
+                    for future in pending:
+                        future.cancel()
+                    raise
+        finally:
+            # The executor has waited for batches already in flight, so an
+            # interrupted run resumes from the last finished entity
+            self._save_import_state()
+
+        imported = f"{success_count}" if total is None else f"{success_count}/{total}"
+        if skipped:
+            imported += f" ({skipped} already imported)"
+        console.print(f"[green][/green] Imported {imported} {entity_type}")
+        return success_count
 
-        console.print(
-            f"[green][/green] Imported {success_count}/{len(entities)} {entity_type}"
-        )
+    @staticmethod
+    def _collect_results(
+        futures, pending: Dict, progress: Progress, task: TaskID
+    ) -> int:
+        """Sum imports from finished batch futures, advancing progress."""
+        success_count = 0
+        for future in futures:
+            success_count += future.result()
+            progress.advance(task, pending.pop(future))
         return success_count
 
+    def import_entity_type(self, entity_type: str, input_dir: Path) -> int:
+        """Import a single entity type, returning the number imported."""
+        count = self._import_entity_type(entity_type, input_dir)
+        # The type has been attempted in full, so there is nothing to resume
+        self._clear_import_state(entity_type)
+        return count
+
     def import_all(self):
         """Import all entities according to configured order."""
         console.print("[bold blue]Starting OpenMetadata Import[/bold blue]")
@@ -325,6 +662,9 @@ class OpenMetadataImporter:
             self.import_stats[entity_type] = count
             total_imported += count
 
+        # Every type has been attempted, so there is nothing left to resume
+        self._clear_import_state()
+
         # Create summary
         self._create_import_summary(input_dir, total_imported)
 
@@ -386,8 +726,23 @@ class OpenMetadataImporter:
     is_flag=True,
     help="Show what would be imported without actually importing",
 )
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip entities already imported by an interrupted previous run",
+)
+@click.option(
+    "--trust-input",
+    is_flag=True,
+    help="Skip client-side validation of exported entities",
+)
 def main(
-    config: str, input_dir: Optional[str], entity_type: Optional[str], dry_run: bool
+    config: str,
+    input_dir: Optional[str],
+    entity_type: Optional[str],
+    dry_run: bool,
+    resume: bool,
+    trust_input: bool,
 ):
     """Import OpenMetadata entities from NDJSON files."""
     try:
@@ -397,6 +752,12 @@ def main(
         if input_dir:
             importer.config["import"]["input_dir"] = input_dir
 
+        if resume:
+            importer.config["import"]["resume"] = True
+
+        if trust_input:
+            importer.config["import"]["trust_input"] = True
+
         if dry_run:
             console.print(
                 "[yellow]DRY RUN MODE - No entities will be imported[/yellow]"
@@ -404,29 +765,27 @@ def main(
             input_path = Path(importer.config["import"]["input_dir"])
 
             if entity_type:
-                filepath = input_path / f"{entity_type}.ndjson"
+                filepath = importer._entity_file(entity_type, input_path)
                 if filepath.exists():
-                    entities = importer._load_ndjson(filepath)
-                    console.print(
-                        f"Would import {len(entities)} {entity_type} entities"
-                    )
+                    count = importer._count_entities(filepath)
+                    console.print(f"Would import {count} {entity_type} entities")
                 else:
                     console.print(f"File not found: {filepath}")
             else:
                 total = 0
                 for et in importer.config["import"]["import_order"]:
-                    filepath = input_path / f"{et}.ndjson"
+                    filepath = importer._entity_file(et, input_path)
                     if filepath.exists():
-                        entities = importer._load_ndjson(filepath)
-                        console.print(f"Would import {len(entities)} {et} entities")
-                        total += len(entities)
+                        count = importer._count_entities(filepath)
+                        console.print(f"Would import {count} {et} entities")
+                        total += count
                 console.print(f"Total entities to import: {total}")
             return
 
         if entity_type:
             # Import specific entity type
             input_path = Path(importer.config["import"]["input_dir"])
-            count = importer._import_entity_type(entity_type, input_path)
+            count = importer.import_entity_type(entity_type, input_path)
             console.print(f"[green]Imported {count} {entity_type} entities[/green]")
         else:
             # Import all entities
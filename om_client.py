@@ -0,0 +1,62 @@
+"""
+Shared OpenMetadata client construction for the migration scripts
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from metadata.generated.schema.entity.services.connections.metadata.openMetadataConnection import (
+    OpenMetadataConnection,
+)
+from metadata.generated.schema.security.client.openMetadataJWTClientConfig import (
+    OpenMetadataJWTClientConfig,
+)
+from metadata.ingestion.ometa.ometa_api import OpenMetadata
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@lru_cache(maxsize=None)
+def get_client(
+    server_url: str,
+    jwt_token: Optional[str] = None,
+    pool_size: int = 32,
+    max_retries: int = 3,
+) -> OpenMetadata:
+    """Return a client for the server, reusing one per process and settings."""
+    if jwt_token:
+        auth_provider = "openmetadata"
+        auth_config = OpenMetadataJWTClientConfig(jwtToken=jwt_token)
+    else:
+        # No authentication for now (can be extended)
+        auth_provider = None
+        auth_config = None
+
+    metadata_connection = OpenMetadataConnection(
+        hostPort=server_url,
+        authProvider=auth_provider,
+        securityConfig=auth_config,
+    )
+
+    client = OpenMetadata(metadata_connection)
+    configure_session(client, pool_size, max_retries)
+    return client
+
+
+def configure_session(client: OpenMetadata, pool_size: int, max_retries: int):
+    """Mount a pooled, retrying HTTP adapter on the SDK's requests session."""
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=max_retries,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            # Hand the final response back to the SDK's own error handling
+            raise_on_status=False,
+        ),
+    )
+
+    session = client.client._session
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
@@ -5,355 +5,653 @@ Tests for OpenMetadata Migration Tool
 
 # Import the import module by loading it as a module
 import importlib.util
+import io
 import json
 import os
 import sys
-import tempfile
-from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+import threading
+import time
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
 
 import pytest
-import yaml
+import requests
+from metadata.generated.schema.entity.domains.domain import Domain
 
 from export import OpenMetadataExporter
+from om_client import configure_session
+
+# Load the import.py module once per process, even if this file is re-imported
+if "import_module" in sys.modules:
+    import_module = sys.modules["import_module"]
+else:
+    spec = importlib.util.spec_from_file_location(
+        "import_module", os.path.join(os.path.dirname(__file__), "import.py")
+    )
+    import_module = importlib.util.module_from_spec(spec)
+    sys.modules["import_module"] = import_module
+    spec.loader.exec_module(import_module)
+OpenMetadataImporter = import_module.OpenMetadataImporter
+
 
-# Load the import.py module
-spec = importlib.util.spec_from_file_location(
-    "import_module", os.path.join(os.path.dirname(__file__), "import.py")
+def _freeze(value: Any) -> Any:
+    """Return a read-only copy of a config: mapping proxies and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Return a mutable copy of a frozen config: dicts and lists."""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+# Read-only so no test can change the config other tests start from
+_BASE_CONFIG = _freeze(
+    {
+        "openmetadata": {
+            "server_url": "http://test.example.com",
+            "auth": {"jwt_token": "test_token"},
+        },
+        "export": {
+            "output_dir": "./test_exports",
+            "entities": {"domains": True, "teams": True, "data_products": False},
+            "selective": {
+                "domains": [],
+                "linked_data_products_only": False,
+                "linked_assets_only": False,
+            },
+            "batch_size": 10,
+        },
+        "import": {
+            "input_dir": "./test_imports",
+            "update_existing": True,
+            "skip_on_error": True,
+            "import_order": ["teams", "domains", "data_products"],
+        },
+        "logging": {"level": "INFO"},
+    }
 )
-import_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(import_module)
-OpenMetadataImporter = import_module.OpenMetadataImporter
 
+# _BASE_CONFIG as YAML, written verbatim so tests need no YAML emitter
+_BASE_CONFIG_YAML = b"""\
+openmetadata:
+  server_url: http://test.example.com
+  auth:
+    jwt_token: test_token
+export:
+  output_dir: ./test_exports
+  entities:
+    domains: true
+    teams: true
+    data_products: false
+  selective:
+    domains: []
+    linked_data_products_only: false
+    linked_assets_only: false
+  batch_size: 10
+import:
+  input_dir: ./test_imports
+  update_existing: true
+  skip_on_error: true
+  import_order:
+    - teams
+    - domains
+    - data_products
+logging:
+  level: INFO
+"""
+
+
+def _deep_update(config: dict, overrides: dict):
+    """Merge overrides into config, descending into nested sections."""
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            _deep_update(config[key], value)
+        else:
+            config[key] = value
+
+
+def _cfg(overrides: Optional[dict] = None) -> dict:
+    """Return a fresh copy of the base test config with overrides applied."""
+    config = _thaw(_BASE_CONFIG)
+    _deep_update(config, overrides or {})
+    return config
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_dotenv():
+    """Keep a developer's .env file out of every test."""
+    with patch("export.load_dotenv"), patch.object(import_module, "load_dotenv"):
+        yield
+
+
+@pytest.fixture(scope="class")
+def test_config():
+    """Test configuration shared by the tests in a class."""
+    return _cfg()
 
+
+@pytest.fixture(scope="class")
+def config_path(tmp_path_factory):
+    """Write the test configuration once per class."""
+    path = tmp_path_factory.mktemp("config") / "config.yaml"
+    path.write_bytes(_BASE_CONFIG_YAML)
+    return str(path)
+
+
+# Keep each class on one worker under `pytest -n auto --dist loadgroup` so its
+# class-scoped fixtures are built once
+@pytest.mark.xdist_group("exporter")
 class TestOpenMetadataExporter:
     """Test cases for OpenMetadata Exporter."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.test_config = {
-            "openmetadata": {
-                "server_url": "http://test.example.com",
-                "auth": {"jwt_token": "test_token"},
-            },
-            "export": {
-                "output_dir": "./test_exports",
-                "entities": {"domains": True, "teams": True, "data_products": False},
-                "selective": {
-                    "domains": [],
-                    "linked_data_products_only": False,
-                    "linked_assets_only": False,
-                },
-                "batch_size": 10,
-            },
-            "logging": {"level": "INFO"},
-        }
+    @pytest.fixture
+    def exporter(self, test_config):
+        """Exporter built from the test config with a mocked client."""
+        with patch.object(OpenMetadataExporter, "_create_client"):
+            yield OpenMetadataExporter.from_dict(test_config)
 
-    def test_load_config(self):
+    def test_load_config(self, config_path, test_config, tmp_path):
         """Test configuration loading."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(self.test_config, f)
-            config_path = f.name
-
-        try:
-            with patch("export.load_dotenv"):
-                with patch.object(OpenMetadataExporter, "_create_client"):
-                    exporter = OpenMetadataExporter(config_path)
-                    assert (
-                        exporter.config["openmetadata"]["server_url"]
-                        == "http://test.example.com"
-                    )
-                    assert exporter.config["export"]["batch_size"] == 10
-        finally:
-            os.unlink(config_path)
-
-    def test_env_overrides(self):
-        """Test environment variable overrides."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(self.test_config, f)
-            config_path = f.name
-
-        try:
-            with patch.dict(
-                os.environ,
-                {
-                    "OPENMETADATA_SERVER_URL": "http://env.example.com",
-                    "EXPORT_BATCH_SIZE": "50",
-                },
+        json_config_path = tmp_path / "config.json"
+        json_config_path.write_text(json.dumps(test_config))
+
+        with patch.object(OpenMetadataExporter, "_create_client"):
+            for source in (
+                config_path,
+                str(json_config_path),
+                json_config_path,
+                io.StringIO(_BASE_CONFIG_YAML.decode()),
             ):
-                with patch("export.load_dotenv"):
-                    with patch.object(OpenMetadataExporter, "_create_client"):
-                        exporter = OpenMetadataExporter(config_path)
-                        exporter._apply_env_overrides()
-                        assert (
-                            exporter.config["openmetadata"]["server_url"]
-                            == "http://env.example.com"
-                        )
-                        assert exporter.config["export"]["batch_size"] == 50
-        finally:
-            os.unlink(config_path)
-
-    @patch("export.OpenMetadata")
-    def test_write_ndjson(self, mock_om):
+                exporter = OpenMetadataExporter(source)
+                assert exporter.config == test_config
+
+    def test_env_overrides(self, exporter):
+        """Test environment variable overrides."""
+        with patch.dict(
+            os.environ,
+            {
+                "OPENMETADATA_SERVER_URL": "http://env.example.com",
+                "EXPORT_BATCH_SIZE": "50",
+            },
+        ):
+            exporter._apply_env_overrides()
+            assert (
+                exporter.config["openmetadata"]["server_url"]
+                == "http://env.example.com"
+            )
+            assert exporter.config["export"]["batch_size"] == 50
+
+    def test_write_ndjson(self, exporter, tmp_path):
         """Test NDJSON file writing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".yaml", delete=False
-            ) as f:
-                test_config = self.test_config.copy()
-                test_config["export"]["output_dir"] = temp_dir
-                yaml.dump(test_config, f)
-                config_path = f.name
-
-            try:
-                with patch("export.load_dotenv"):
-                    exporter = OpenMetadataExporter(config_path)
-
-                    test_entities = [
-                        {"id": "1", "name": "test1"},
-                        {"id": "2", "name": "test2"},
-                    ]
-
-                    count = exporter._write_ndjson(
-                        test_entities, "test_entities", Path(temp_dir)
-                    )
-                    assert count == 2
-
-                    # Verify file content
-                    ndjson_file = Path(temp_dir) / "test_entities.ndjson"
-                    assert ndjson_file.exists()
-
-                    with open(ndjson_file, "r") as f:
-                        lines = f.readlines()
-                        assert len(lines) == 2
-                        entity1 = json.loads(lines[0])
-                        assert entity1["name"] == "test1"
-            finally:
-                os.unlink(config_path)
-
-    @patch("export.OpenMetadata")
-    def test_export_entity_type_sdk(self, mock_om):
+        test_entities = [
+            {"id": "1", "name": "test1"},
+            {"id": "2", "name": "test2"},
+        ]
+
+        count = exporter._write_ndjson(test_entities, "test_entities", tmp_path)
+        assert count == 2
+
+        # Verify file content
+        ndjson_file = tmp_path / "test_entities.ndjson"
+        assert ndjson_file.exists()
+
+        lines = ndjson_file.read_text().splitlines()
+        assert len(lines) == 2
+        entity1 = json.loads(lines[0])
+        assert entity1["name"] == "test1"
+
+    def test_export_entity_type_sdk(self, exporter, tmp_path):
         """Test SDK-based entity export."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".yaml", delete=False
-            ) as f:
-                test_config = self.test_config.copy()
-                test_config["export"]["output_dir"] = temp_dir
-                yaml.dump(test_config, f)
-                config_path = f.name
-
-            try:
-                with patch("export.load_dotenv"):
-                    # Mock the SDK entities response
-                    mock_entity1 = Mock()
-                    mock_entity1.model_dump.return_value = {
-                        "id": "1",
-                        "name": "Test Domain 1",
-                    }
-                    mock_entity2 = Mock()
-                    mock_entity2.model_dump.return_value = {
-                        "id": "2",
-                        "name": "Test Domain 2",
-                    }
-
-                    mock_response = Mock()
-                    mock_response.entities = [mock_entity1, mock_entity2]
-
-                    exporter = OpenMetadataExporter(config_path)
-                    exporter.om_client.list_entities.return_value = mock_response
-
-                    # Test exporting with mock entity class
-                    from metadata.generated.schema.entity.domains.domain import (
-                        Domain,
-                    )
-
-                    count = exporter._export_entity_type(
-                        "domains", Domain, Path(temp_dir)
-                    )
-
-                    assert count == 2
-                    assert exporter.om_client.list_entities.called
-
-                    # Verify file was created
-                    ndjson_file = Path(temp_dir) / "domains.ndjson"
-                    assert ndjson_file.exists()
-            finally:
-                os.unlink(config_path)
-
-    def test_selective_export_entities(self):
+        # Mock the raw API list response
+        mock_response = {
+            "data": [
+                {"id": "1", "name": "Test Domain 1"},
+                {"id": "2", "name": "Test Domain 2"},
+            ],
+            "paging": {"total": 2},
+        }
+        exporter.om_client.client.get.return_value = mock_response
+
+        count = exporter._export_entity_type("domains", Domain, tmp_path)
+
+        assert count == 2
+        exporter.om_client.get_suffix.assert_called_with(Domain)
+        assert exporter.om_client.client.get.called
+
+        # Verify file was created
+        ndjson_file = tmp_path / "domains.ndjson"
+        assert ndjson_file.exists()
+
+    def test_export_entity_type_paginates(self, exporter, tmp_path):
+        """Test that export follows the `after` cursor across pages."""
+        exporter.om_client.client.get.side_effect = [
+            {
+                "data": [{"name": "d1"}, {"name": "d2"}],
+                "paging": {"after": "cursor1", "total": 3},
+            },
+            {"data": [{"name": "d3"}], "paging": {"total": 3}},
+        ]
+
+        count = exporter._export_entity_type("domains", SimpleNamespace(), tmp_path)
+
+        assert count == 3
+        calls = exporter.om_client.client.get.call_args_list
+        assert [c.kwargs["data"] for c in calls] == [
+            {"limit": 10},
+            {"limit": 10, "after": "cursor1"},
+        ]
+
+        ndjson_file = tmp_path / "domains.ndjson"
+        lines = ndjson_file.read_text().splitlines()
+        names = [json.loads(line)["name"] for line in lines]
+        assert names == ["d1", "d2", "d3"]
+
+    def test_export_failure_keeps_previous_file(self, exporter, tmp_path):
+        """Test that a failed page leaves the previous export in place."""
+        ndjson_file = tmp_path / "domains.ndjson"
+        ndjson_file.write_text('{"name": "old"}\n')
+        exporter.om_client.client.get.side_effect = [
+            {"data": [{"name": "d1"}], "paging": {"after": "cursor1"}},
+            RuntimeError("boom"),
+        ]
+
+        count = exporter._export_entity_type("domains", SimpleNamespace(), tmp_path)
+
+        assert count == 0
+        assert ndjson_file.read_text() == '{"name": "old"}\n'
+        assert list(tmp_path.iterdir()) == [ndjson_file]
+
+    def test_configure_session(self, test_config):
+        """Test that a pooled keep-alive adapter is mounted on the SDK session."""
+        with patch("export.get_client") as mock_get_client:
+            OpenMetadataExporter.from_dict(test_config)
+
+        mock_get_client.assert_called_once_with(
+            "http://test.example.com", "test_token", pool_size=32, max_retries=3
+        )
+
+        client = SimpleNamespace(client=SimpleNamespace(_session=requests.Session()))
+        configure_session(client, 32, 3)
+
+        adapter = client.client._session.get_adapter("https://example.com")
+        assert adapter._pool_maxsize == 32
+        assert adapter.max_retries.total == 3
+
+    @patch.object(OpenMetadataExporter, "_export_entity_type", return_value=5)
+    def test_selective_export_entities(self, mock_export, exporter, tmp_path):
         """Test selective export using entity list."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(self.test_config, f)
-            config_path = f.name
-
-        try:
-            with patch("export.load_dotenv"):
-                with patch.object(OpenMetadataExporter, "_create_client"):
-                    with patch.object(
-                        OpenMetadataExporter, "_export_entity_type"
-                    ) as mock_export:
-                        mock_export.return_value = 5
-
-                        exporter = OpenMetadataExporter(config_path)
-                        exporter.export_all(selected_entities=["domains", "teams"])
-
-                        # Should only export the selected entities
-                        assert mock_export.call_count == 2
-                        call_args = [call[0] for call in mock_export.call_args_list]
-                        entity_names = [args[0] for args in call_args]
-                        assert "domains" in entity_names
-                        assert "teams" in entity_names
-        finally:
-            os.unlink(config_path)
+        exporter.config["export"]["output_dir"] = str(tmp_path)
+        exporter.export_all(selected_entities=["domains", "teams"])
+
+        # Should only export the selected entities
+        assert mock_export.call_count == 2
+        call_args = [call[0] for call in mock_export.call_args_list]
+        entity_names = [args[0] for args in call_args]
+        assert "domains" in entity_names
+        assert "teams" in entity_names
 
 
+@pytest.mark.xdist_group("importer")
 class TestOpenMetadataImporter:
     """Test cases for OpenMetadata Importer."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.test_config = {
-            "openmetadata": {
-                "server_url": "http://test.example.com",
-                "auth": {"jwt_token": "test_token"},
+    @pytest.fixture
+    def importer(self, test_config):
+        """Importer built from the test config with a mocked client."""
+        with patch.object(OpenMetadataImporter, "_create_client"):
+            yield OpenMetadataImporter.from_dict(test_config)
+
+    def test_load_ndjson(self, importer, tmp_path):
+        """Test NDJSON file loading."""
+        ndjson_file = tmp_path / "test.ndjson"
+
+        test_data = [{"id": "1", "name": "entity1"}, {"id": "2", "name": "entity2"}]
+
+        ndjson_file.write_text("".join(json.dumps(e) + "\n" for e in test_data))
+
+        entities = importer._load_ndjson(ndjson_file)
+
+        assert len(entities) == 2
+        assert entities[0]["name"] == "entity1"
+        assert entities[1]["name"] == "entity2"
+
+    def test_count_ndjson(self, importer, tmp_path):
+        """Test counting NDJSON entities without parsing them."""
+        ndjson_file = tmp_path / "test.ndjson"
+        ndjson_file.write_text('{"id": "1"}\n\n{"id": "2"}\n  \n{"id": "3"}')
+
+        assert importer._count_ndjson(ndjson_file) == 3
+
+    def test_import_entity_type_parallel(self, importer, tmp_path):
+        """Test that concurrent imports are all counted."""
+        ndjson_file = tmp_path / "teams.ndjson"
+        ndjson_file.write_text(
+            "".join(json.dumps({"name": f"team{i}"}) + "\n" for i in range(20))
+        )
+
+        importer.config["import"]["parallelism"] = 4
+        importer.config["import"]["bulk_size"] = 1
+
+        with patch.object(
+            importer,
+            "_import_entity",
+            side_effect=lambda e, t: e["name"] != "team3",
+        ) as mock_import:
+            count = importer._import_entity_type("teams", tmp_path)
+
+        assert count == 19
+        assert mock_import.call_count == 20
+
+    def test_import_entity_dispatch(self, importer):
+        """Test that entities are sent through the generic create_or_update."""
+        assert importer._import_entity(
+            {"name": "team1", "teamType": "Group", "id": "x"}, "teams"
+        )
+        request = importer.om_client.create_or_update.call_args[0][0]
+        assert isinstance(request, import_module.CreateTeamRequest)
+        assert request.name.root == "team1"
+
+        assert not importer._import_entity({"name": "t"}, "topics")
+
+        # Trusted input is passed through without validation
+        importer.config["import"]["trust_input"] = True
+        request = importer._build_request(
+            {"name": "team1", "teamType": "Group"}, "teams"
+        )
+        assert request.name == "team1"
+
+    def test_filter_entity_fields_shrinks_references(self, importer):
+        """Test that embedded references are reduced for create requests."""
+        owner = {"id": "u1", "type": "user", "name": "alice", "href": "http://x"}
+        team = importer._filter_entity_fields(
+            {
+                "name": "team1",
+                "owners": [owner],
+                "parents": [{"id": "t0", "type": "team", "name": "org"}],
+                "description": "Team one",
             },
-            "import": {
-                "input_dir": "./test_imports",
-                "update_existing": True,
-                "skip_on_error": True,
-                "import_order": ["teams", "domains", "data_products"],
+            "teams",
+        )
+        assert team["owners"] == [{"id": "u1", "type": "user"}]
+        assert team["parents"] == ["t0"]
+        assert team["description"] == "Team one"
+
+        product = importer._filter_entity_fields(
+            {
+                "name": "product1",
+                "domain": {"id": "d1", "fullyQualifiedName": "Sales"},
+                "experts": [{"id": "u1", "fullyQualifiedName": "alice"}],
             },
-            "logging": {"level": "INFO"},
+            "data_products",
+        )
+        assert product["domain"] == "Sales"
+        assert product["experts"] == ["alice"]
+
+    def test_configure_session_matches_parallelism(self):
+        """Test that the HTTP pool is never smaller than import parallelism."""
+        with patch.object(import_module, "get_client") as mock_get_client:
+            OpenMetadataImporter.from_dict(_cfg({"import": {"parallelism": 64}}))
+
+        assert mock_get_client.call_args.kwargs["pool_size"] == 64
+
+    def test_bulk_import(self, importer):
+        """Test bulk import and the per-entity fallback."""
+        importer.om_client = MagicMock()
+        importer.om_client.get_suffix.return_value = "/teams"
+        importer.om_client.client.put.return_value = {
+            "failedRequest": [{"message": "team2 rejected"}]
         }
-
-    def test_load_ndjson(self):
-        """Test NDJSON file loading."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            ndjson_file = Path(temp_dir) / "test.ndjson"
-
-            test_data = [{"id": "1", "name": "entity1"}, {"id": "2", "name": "entity2"}]
-
-            with open(ndjson_file, "w") as f:
-                for entity in test_data:
-                    json.dump(entity, f)
-                    f.write("\n")
-
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".yaml", delete=False
-            ) as f:
-                yaml.dump(self.test_config, f)
-                config_path = f.name
-
-            try:
-                with patch.object(import_module, "load_dotenv"):
-                    with patch.object(OpenMetadataImporter, "_create_client"):
-                        importer = OpenMetadataImporter(config_path)
-                        entities = importer._load_ndjson(ndjson_file)
-
-                        assert len(entities) == 2
-                        assert entities[0]["name"] == "entity1"
-                        assert entities[1]["name"] == "entity2"
-            finally:
-                os.unlink(config_path)
-
-    def test_env_overrides_import(self):
-        """Test environment variable overrides for import."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(self.test_config, f)
-            config_path = f.name
-
-        try:
-            with patch.dict(
-                os.environ,
+        batch = [
+            {"name": "team1", "teamType": "Group"},
+            {"name": "team2", "teamType": "Group"},
+            {"name": "team3", "teamType": "Group"},
+        ]
+
+        assert importer._import_batch(batch, "teams") == 2
+        (path,) = importer.om_client.client.put.call_args[0]
+        assert path == "/teams/bulk"
+        payload = json.loads(importer.om_client.client.put.call_args[1]["data"])
+        assert [p["name"] for p in payload] == ["team1", "team2", "team3"]
+        assert importer.errors == ["Error importing teams entity: team2 rejected"]
+
+        # Servers without the bulk endpoint fall back to single requests
+        not_found = requests.HTTPError(response=SimpleNamespace(status_code=404))
+        importer.om_client.client.put.side_effect = not_found
+        assert importer._import_batch(batch, "teams") == 3
+        assert importer.om_client.create_or_update.call_count == 3
+        assert "teams" in importer._bulk_unsupported
+
+    def test_resume_import(self, importer, tmp_path):
+        """Test that a resumed import skips checkpointed entities."""
+        (tmp_path / "teams.ndjson").write_text(
+            "\n".join(
+                json.dumps({"name": name, "fullyQualifiedName": name})
+                for name in ("team1", "team2", "team3")
+            )
+            + "\n"
+        )
+        (tmp_path / "import_state.json").write_text(
+            json.dumps(
                 {
-                    "IMPORT_INPUT_DIR": "/custom/import/dir",
-                    "IMPORT_SKIP_ON_ERROR": "false",
-                },
-            ):
-                with patch.object(import_module, "load_dotenv"):
-                    with patch.object(OpenMetadataImporter, "_create_client"):
-                        importer = OpenMetadataImporter(config_path)
-                        importer._apply_env_overrides()
-                        assert (
-                            importer.config["import"]["input_dir"]
-                            == "/custom/import/dir"
-                        )
-                        assert importer.config["import"]["skip_on_error"] == False
-        finally:
-            os.unlink(config_path)
+                    "server_url": _BASE_CONFIG["openmetadata"]["server_url"],
+                    "entities": {"teams": ["team1", "team2"]},
+                }
+            )
+        )
+
+        importer.config["import"]["resume"] = True
+        importer.config["import"]["bulk_size"] = 1
+
+        with patch.object(importer, "_import_entity", return_value=True) as mock_import:
+            # Checkpointed entities are skipped, not counted as imported
+            assert importer._import_entity_type("teams", tmp_path) == 1
+
+        mock_import.assert_called_once()
+        assert mock_import.call_args[0][0]["name"] == "team3"
+
+    def test_single_type_import_clears_state(self, importer, tmp_path):
+        """Test that a finished single-type import leaves nothing to resume."""
+        (tmp_path / "teams.ndjson").write_text(
+            "\n".join(
+                json.dumps({"name": name, "fullyQualifiedName": name})
+                for name in ("team1", "team2", "team3")
+            )
+            + "\n"
+        )
+        importer.config["import"]["bulk_size"] = 1
+
+        def import_entity(entity_data, entity_type):
+            importer._mark_imported(entity_type, [entity_data])
+            return True
+
+        with patch.object(importer, "_import_entity", side_effect=import_entity):
+            assert importer.import_entity_type("teams", tmp_path) == 3
+            assert not (tmp_path / "import_state.json").exists()
+
+            # A later resumed run against a wiped server imports everything
+            importer.config["import"]["resume"] = True
+            assert importer.import_entity_type("teams", tmp_path) == 3
+
+    def test_resume_ignores_other_server(self, importer, tmp_path):
+        """Test that a checkpoint written for another server is not resumed."""
+        (tmp_path / "teams.ndjson").write_text(
+            json.dumps({"name": "team1", "fullyQualifiedName": "team1"}) + "\n"
+        )
+        (tmp_path / "import_state.json").write_text(
+            json.dumps(
+                {"server_url": "http://other:8585", "entities": {"teams": ["team1"]}}
+            )
+        )
+        importer.config["import"]["resume"] = True
+
+        with patch.object(importer, "_import_entity", return_value=True):
+            assert importer._import_entity_type("teams", tmp_path) == 1
+
+    def test_interrupted_import_saves_state(self, importer, tmp_path):
+        """Test that batches still in flight when interrupted are checkpointed."""
+        names = [f"product{i}" for i in range(4)]
+        (tmp_path / "data_products.ndjson").write_text(
+            "\n".join(
+                json.dumps({"name": name, "fullyQualifiedName": name}) for name in names
+            )
+            + "\n"
+        )
+
+        importer.config["import"]["bulk_size"] = 1
+        importer.config["import"]["parallelism"] = 4
+
+        # Every batch is in flight before the first one is interrupted
+        started = threading.Barrier(len(names))
+
+        def import_entity(entity_data, entity_type):
+            started.wait()
+            if entity_data["name"] == "product0":
+                raise KeyboardInterrupt
+            # Still running when the interrupt reaches the main thread
+            time.sleep(0.05)
+            importer._mark_imported(entity_type, [entity_data])
+            return True
+
+        with patch.object(importer, "_import_entity", side_effect=import_entity):
+            with pytest.raises(KeyboardInterrupt):
+                importer._import_entity_type("data_products", tmp_path)
+
+        state = json.loads((tmp_path / "import_state.json").read_text())
+        assert state["entities"] == {"data_products": names[1:]}
+
+    def test_self_referencing_import_order(self, importer, tmp_path):
+        """Test that parents are imported before the children listed after them."""
+        names = [f"team{i}" for i in range(10)]
+        (tmp_path / "teams.ndjson").write_text(
+            "\n".join(json.dumps({"name": name}) for name in names) + "\n"
+        )
+
+        importer.config["import"]["bulk_size"] = 1
+        importer.config["import"]["parallelism"] = 16
+
+        imported = []
+
+        def import_entity(entity_data, entity_type):
+            # Earlier entities are slower, so concurrent batches would reorder
+            time.sleep((len(names) - names.index(entity_data["name"])) / 1000)
+            imported.append(entity_data["name"])
+            return True
+
+        with patch.object(importer, "_import_entity", side_effect=import_entity):
+            assert importer._import_entity_type("teams", tmp_path) == len(names)
+
+        assert imported == names
+
+    def test_env_overrides_import(self, importer):
+        """Test environment variable overrides for import."""
+        with patch.dict(
+            os.environ,
+            {
+                "IMPORT_INPUT_DIR": "/custom/import/dir",
+                "IMPORT_SKIP_ON_ERROR": "false",
+            },
+        ):
+            importer._apply_env_overrides()
+            assert importer.config["import"]["input_dir"] == "/custom/import/dir"
+            assert importer.config["import"]["skip_on_error"] == False
 
 
+@pytest.mark.xdist_group("integration")
 class TestIntegration:
     """Integration tests for export/import workflow."""
 
-    def test_export_import_workflow(self):
+    def test_export_import_workflow(self, tmp_path):
         """Test a complete export/import cycle with mock data."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Set up test configuration
-            test_config = {
-                "openmetadata": {
-                    "server_url": "http://test.example.com",
-                    "auth": {"jwt_token": "test_token"},
-                },
-                "export": {
-                    "output_dir": temp_dir,
-                    "entities": {"teams": True, "domains": True},
-                    "selective": {
-                        "domains": [],
-                        "linked_data_products_only": False,
-                        "linked_assets_only": False,
-                    },
+        # Set up test configuration
+        test_config = _cfg(
+            {
+                "export": {"output_dir": str(tmp_path)},
+                "import": {
+                    "input_dir": str(tmp_path),
+                    "import_order": ["teams", "domains"],
                 },
-                "import": {"input_dir": temp_dir, "import_order": ["teams", "domains"]},
-                "logging": {"level": "INFO"},
             }
-
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".yaml", delete=False
-            ) as f:
-                yaml.dump(test_config, f)
-                config_path = f.name
-
-            try:
-                # Mock export data
-                mock_teams = [
-                    {"id": "t1", "name": "Team 1"},
-                    {"id": "t2", "name": "Team 2"},
-                ]
-                mock_domains = [{"id": "d1", "name": "Domain 1"}]
-
-                # Test export
-                with patch("export.load_dotenv"):
-                    with patch.object(OpenMetadataExporter, "_create_client"):
-                        exporter = OpenMetadataExporter(config_path)
-
-                        # Write test data
-                        exporter._write_ndjson(mock_teams, "teams", Path(temp_dir))
-                        exporter._write_ndjson(mock_domains, "domains", Path(temp_dir))
-
-                # Verify exported files exist
-                teams_file = Path(temp_dir) / "teams.ndjson"
-                domains_file = Path(temp_dir) / "domains.ndjson"
-                assert teams_file.exists()
-                assert domains_file.exists()
-
-                # Test import
-                with patch.object(import_module, "load_dotenv"):
-                    with patch.object(OpenMetadataImporter, "_create_client"):
-                        importer = OpenMetadataImporter(config_path)
-
-                        # Load and verify data
-                        teams_data = importer._load_ndjson(teams_file)
-                        domains_data = importer._load_ndjson(domains_file)
-
-                        assert len(teams_data) == 2
-                        assert len(domains_data) == 1
-                        assert teams_data[0]["name"] == "Team 1"
-                        assert domains_data[0]["name"] == "Domain 1"
-
-            finally:
-                os.unlink(config_path)
+        )
+
+        # Mock export data
+        mock_teams = [
+            {"id": "t1", "name": "Team 1"},
+            {"id": "t2", "name": "Team 2"},
+        ]
+        mock_domains = [{"id": "d1", "name": "Domain 1"}]
+
+        # Test export
+        with patch.object(OpenMetadataExporter, "_create_client"):
+            exporter = OpenMetadataExporter.from_dict(test_config)
+
+            # Write test data
+            exporter._write_ndjson(mock_teams, "teams", tmp_path)
+            exporter._write_ndjson(mock_domains, "domains", tmp_path)
+
+        # Verify exported files exist
+        teams_file = tmp_path / "teams.ndjson"
+        domains_file = tmp_path / "domains.ndjson"
+        assert teams_file.exists()
+        assert domains_file.exists()
+
+        # Test import
+        with patch.object(OpenMetadataImporter, "_create_client"):
+            importer = OpenMetadataImporter.from_dict(test_config)
+
+            # Load and verify data
+            teams_data = importer._load_ndjson(teams_file)
+            domains_data = importer._load_ndjson(domains_file)
+
+            assert len(teams_data) == 2
+            assert len(domains_data) == 1
+            assert teams_data[0]["name"] == "Team 1"
+            assert domains_data[0]["name"] == "Domain 1"
+
+    def test_msgpack_export_import_workflow(self, tmp_path):
+        """Test a MessagePack export read back by the importer."""
+        pytest.importorskip("msgpack")
+
+        test_config = _cfg(
+            {
+                "export": {"output_dir": str(tmp_path), "format": "msgpack"},
+                "import": {"input_dir": str(tmp_path), "import_order": ["teams"]},
+            }
+        )
+
+        with patch.object(OpenMetadataExporter, "_create_client"):
+            exporter = OpenMetadataExporter.from_dict(test_config)
+            exporter.om_client = MagicMock()
+            exporter.om_client.client.get.return_value = {
+                "data": [{"id": "t1", "name": "Team 1"}],
+                "paging": {"total": 1},
+            }
+            count = exporter._export_entity_type("teams", SimpleNamespace(), tmp_path)
+            assert count == 1
+
+        with patch.object(OpenMetadataImporter, "_create_client"):
+            importer = OpenMetadataImporter.from_dict(test_config)
+
+            teams_file = importer._entity_file("teams", tmp_path)
+            assert teams_file.suffix == ".msgpack"
+            assert importer._count_entities(teams_file) == 1
+            teams = list(importer._iter_entities(teams_file))
+            assert teams[0]["name"] == "Team 1"
+
+            # The import decodes the file once, without counting it first
+            with patch.object(
+                importer, "_iter_msgpack", wraps=importer._iter_msgpack
+            ) as mock_iter, patch.object(importer, "_import_entity", return_value=True):
+                assert importer._import_entity_type("teams", tmp_path) == 1
+            mock_iter.assert_called_once()
 
 
 if __name__ == "__main__":